@@ -277,12 +277,12 @@ def traiter_remboursement_kkiapay(payment_id):
     """
     try:
         from .models import Payment
-        from payments.services import KKiaPayService
+        from payments.services import get_kkiapay_service
         
         payment = Payment.objects.get(id=payment_id)
         
         # Traitement via KKiaPay
-        kkiapay_service = KKiaPayService()
+        kkiapay_service = get_kkiapay_service()
         transaction_data = {
             'amount': payment.montant,
             'phone': payment.numero_telephone,
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 04:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='date_lecture',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Date de lecture'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='est_lue',
+            field=models.BooleanField(default=False, verbose_name='Lue'),
+        ),
+    ]
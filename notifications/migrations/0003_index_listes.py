@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-17 04:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notifications', '0002_notification_lecture'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['utilisateur', 'est_lue', 'date_creation'], name='core_notifi_utilisa_a5e832_idx'),
+        ),
+    ]
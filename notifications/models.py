@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
+from django.core.cache import cache
 
 User = get_user_model()
 
@@ -18,6 +19,11 @@ class Notification(models.Model):
         ('email', 'Email'),
     ]
     
+    # Cache des notifications récentes (invalidé par notifications.signals)
+    RECENTES_CACHE_TIMEOUT = 60
+    RECENTES_CACHE_MAX = 50
+    RECENTES_CHAMPS = ('id', 'utilisateur_id', 'titre', 'date_creation', 'envoye')
+    
     # Champs principaux
     utilisateur = models.ForeignKey(
         User, 
@@ -44,6 +50,10 @@ class Notification(models.Model):
     envoye = models.BooleanField(default=False, verbose_name="Envoyé")
     date_envoi = models.DateTimeField(null=True, blank=True, verbose_name="Date d'envoi")
     
+    # Lecture
+    est_lue = models.BooleanField(default=False, verbose_name="Lue")
+    date_lecture = models.DateTimeField(null=True, blank=True, verbose_name="Date de lecture")
+    
     # Relation générique vers n'importe quel objet
     content_type = models.ForeignKey(
         ContentType,
@@ -76,15 +86,45 @@ class Notification(models.Model):
         ordering = ['-date_creation']
         indexes = [
             models.Index(fields=['utilisateur', 'date_creation']),
+            models.Index(fields=['utilisateur', 'est_lue', 'date_creation']),
             models.Index(fields=['canal']),
         ]
     
     def __str__(self):
         return f"{self.titre} - {self.utilisateur.username}"
     
+    def marquer_comme_lue(self):
+        """Marque la notification comme lue."""
+        self.est_lue = True
+        self.date_lecture = timezone.now()
+        self.save(update_fields=['est_lue', 'date_lecture'])
+    
+    @staticmethod
+    def cle_cache_recentes(utilisateur_id):
+        """Clé de cache des notifications récentes d'un utilisateur."""
+        return f"notifications:recentes:{utilisateur_id}"
+    
     @classmethod
     def get_recentes(cls, utilisateur, limit=10):
-        """Retourne les notifications récentes pour un utilisateur."""
-        return cls.objects.filter(
+        """
+        Retourne les notifications récentes pour un utilisateur.
+        Seuls les champs d'aperçu sont chargés (les autres sont différés) ;
+        les lignes correspondantes sont mises en cache par utilisateur.
+        """
+        queryset = cls.objects.filter(
             utilisateur=utilisateur
-        ).order_by('-date_creation')[:limit]
\ No newline at end of file
+        ).order_by('-date_creation')
+        
+        if limit > cls.RECENTES_CACHE_MAX:
+            return list(queryset.only(*cls.RECENTES_CHAMPS)[:limit])
+        
+        lignes = cache.get_or_set(
+            cls.cle_cache_recentes(utilisateur.pk),
+            lambda: list(queryset.values_list(*cls.RECENTES_CHAMPS)[:cls.RECENTES_CACHE_MAX]),
+            cls.RECENTES_CACHE_TIMEOUT
+        )
+        # Instances équivalentes à .only(), reconstruites sans requête
+        return [
+            cls.from_db(queryset.db, cls.RECENTES_CHAMPS, ligne)
+            for ligne in lignes[:limit]
+        ]
@@ -15,10 +15,11 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'utilisateur', 'utilisateur_nom', 'titre', 'message',
             'canal', 'envoye', 'date_creation', 'date_envoi',
+            'est_lue', 'date_lecture',
             'content_type', 'object_id', 'objet_lie_nom',
             'donnees_supplementaires', 'actions'
         ]
-        read_only_fields = ['id', 'date_creation', 'date_envoi']
+        read_only_fields = ['id', 'date_creation', 'date_envoi', 'date_lecture']
     
     def get_objet_lie_nom(self, obj):
         """Retourne une représentation string de l'objet lié"""
@@ -27,6 +28,15 @@ class NotificationSerializer(serializers.ModelSerializer):
         return None
 
 
+class NotificationBadgeSerializer(serializers.ModelSerializer):
+    """Serializer allégé pour les badges de notifications non lues"""
+    
+    class Meta:
+        model = Notification
+        fields = ['id', 'titre', 'message', 'canal', 'est_lue', 'date_creation']
+        read_only_fields = fields
+
+
 class NotificationCreateSerializer(serializers.ModelSerializer):
     """Serializer pour la création de notifications"""
     
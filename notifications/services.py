@@ -1,14 +1,22 @@
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from .models import Notification
 from typing import Dict, List, Optional, Any
+from contextlib import contextmanager
 import logging
+import threading
 from drf_spectacular.utils import extend_schema, OpenApiExample
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Notifications en attente du bloc NotificationService.regrouper() courant (par thread)
+_file_attente = threading.local()
+
 
 class NotificationService:
     """
@@ -66,9 +74,9 @@ class NotificationService:
                 actions=actions
             )
             
-            # Envoi immédiat si demandé
+            # Envoi immédiat si demandé, une fois la notification enregistrée
             if envoyer_immediatement and canal != 'app':
-                NotificationService.envoyer_notification(notification)
+                NotificationService.planifier_envoi([notification])
             
             logger.info(f"Notification créée: {notification.id} pour {utilisateur.username}")
             return notification
@@ -88,9 +96,10 @@ class NotificationService:
         Crée une notification pour une adhésion validée par un agent.
         """
         titre = "Adhésion validée !"
+        agent_nom = agent.get_full_name()
         message = (
             f"Félicitations ! Votre demande d'adhésion a été validée par l'agent "
-            f"{agent.get_full_name()}. Vous pouvez maintenant payer les frais "
+            f"{agent_nom}. Vous pouvez maintenant payer les frais "
             f"d'adhésion pour rejoindre la tontine {tontine.nom}."
         )
         
@@ -108,7 +117,7 @@ class NotificationService:
             'tontine_id': tontine.id,
             'tontine_nom': tontine.nom,
             'agent_id': agent.id,
-            'agent_nom': agent.get_full_name(),
+            'agent_nom': agent_nom,
             'montant_adhesion': montant_adhesion,
             'type_action': 'paiement_adhesion'
         }
@@ -211,6 +220,19 @@ class NotificationService:
             actions=actions
         )
     
+    @staticmethod
+    def planifier_envoi(notifications: List[Notification]) -> None:
+        """
+        Programme l'envoi des notifications après validation de la transaction en cours.
+        L'appelant n'attend pas le canal externe et aucun envoi ne part pour une
+        notification annulée par un rollback.
+        """
+        def envoyer():
+            for notification in notifications:
+                NotificationService.envoyer_notification(notification)
+        
+        transaction.on_commit(envoyer)
+    
     @staticmethod
     def envoyer_notification(notification: Notification) -> bool:
         """
@@ -251,25 +273,167 @@ class NotificationService:
     ) -> List[Notification]:
         """
         Envoie une notification à plusieurs utilisateurs.
+        
+        Les notifications sont créées en une seule insertion groupée : tout ou
+        rien. Si une ligne échoue, aucun destinataire n'est notifié et
+        l'exception est propagée à l'appelant.
+        """
+        utilisateurs = list(utilisateurs)
+        try:
+            return NotificationService.bulk_creer(
+                utilisateurs,
+                titre=titre,
+                message=message,
+                canal=canal,
+                donnees_supplementaires=donnees_supplementaires,
+                actions=actions
+            )
+        except Exception as e:
+            logger.error(
+                "Erreur lors de la création des notifications en masse (%d destinataires): %s",
+                len(utilisateurs), e
+            )
+            raise
+    
+    @staticmethod
+    def bulk_creer(
+        utilisateurs,
+        titre: str,
+        message: str,
+        canal: str = 'app',
+        donnees_supplementaires: Dict = None,
+        actions: List[Dict] = None
+    ) -> List[Notification]:
+        """
+        Crée la même notification pour plusieurs utilisateurs par lots d'INSERT.
+        
+        Args:
+            utilisateurs: Utilisateurs destinataires
+            titre: Titre de la notification
+            message: Message de la notification
+            canal: Canal de diffusion (app, email)
+            donnees_supplementaires: Données JSON supplémentaires
+            actions: Liste des actions disponibles
+            
+        Returns:
+            List[Notification]: Les notifications créées
         """
-        notifications = []
+        utilisateurs = list(utilisateurs)
         
-        for utilisateur in utilisateurs:
-            try:
-                notification = NotificationService.creer_notification(
-                    utilisateur=utilisateur,
-                    titre=titre,
-                    message=message,
-                    canal=canal,
-                    donnees_supplementaires=donnees_supplementaires,
-                    actions=actions
-                )
-                notifications.append(notification)
-            except Exception as e:
-                logger.error(f"Erreur lors de la création de notification pour {utilisateur.username}: {str(e)}")
+        # Contenu commun partagé par toutes les lignes (sérialisé en JSON à l'insertion)
+        donnees_supplementaires = donnees_supplementaires or {}
+        actions = actions or []
+        
+        notifications = NotificationService._inserer_en_masse([
+            Notification(
+                utilisateur=utilisateur,
+                titre=titre,
+                message=message,
+                canal=canal,
+                donnees_supplementaires=donnees_supplementaires,
+                actions=actions
+            )
+            for utilisateur in utilisateurs
+        ])
+        
+        logger.info(f"{len(notifications)} notifications créées en masse")
+        return notifications
+    
+    @staticmethod
+    def _inserer_en_masse(notifications: List[Notification]) -> List[Notification]:
+        """
+        Insère des notifications déjà construites par lots, puis programme
+        l'envoi de celles qui passent par un canal externe.
+        """
+        notifications = Notification.objects.bulk_create(
+            notifications,
+            batch_size=getattr(settings, 'NOTIF_BULK_BATCH', 500)
+        )
+        
+        # bulk_create n'émet pas post_save : invalidation explicite du cache des récentes
+        cache.delete_many(list({
+            Notification.cle_cache_recentes(n.utilisateur_id) for n in notifications
+        }))
+        
+        a_envoyer = [n for n in notifications if n.canal != 'app']
+        if a_envoyer:
+            NotificationService.planifier_envoi(a_envoyer)
         
         return notifications
     
+    @staticmethod
+    @contextmanager
+    def regrouper():
+        """
+        Regroupe les notifications mises en file dans le bloc : elles sont
+        créées en un seul bulk_create après validation de la transaction.
+        Rien n'est créé si le bloc lève une exception.
+
+        Dans une transaction englobante, l'insertion n'a lieu qu'au commit :
+        en sortie de bloc, les notifications sont seulement en file. Une erreur
+        d'insertion à ce moment est journalisée sans remonter à l'appelant.
+        """
+        precedente = getattr(_file_attente, 'notifications', None)
+        en_attente = _file_attente.notifications = []
+        try:
+            yield
+        finally:
+            _file_attente.notifications = precedente
+        
+        if en_attente:
+            if precedente is not None:
+                # Bloc imbriqué : le bloc englobant se charge de l'insertion
+                precedente.extend(en_attente)
+            else:
+                def inserer():
+                    try:
+                        NotificationService._inserer_en_masse(en_attente)
+                    except Exception as e:
+                        logger.error(
+                            "Erreur lors de la création groupée de %d notifications: %s",
+                            len(en_attente), e
+                        )
+
+                transaction.on_commit(inserer)
+    
+    @staticmethod
+    def mettre_en_file(
+        utilisateur,
+        titre: str,
+        message: str,
+        canal: str = 'app',
+        objet_lie: Optional[Any] = None,
+        donnees_supplementaires: Dict = None,
+        actions: List[Dict] = None
+    ) -> None:
+        """
+        Met une notification en attente dans le bloc regrouper() courant.
+        Hors d'un tel bloc, la notification est créée immédiatement.
+        """
+        en_attente = getattr(_file_attente, 'notifications', None)
+        if en_attente is None:
+            NotificationService.creer_notification(
+                utilisateur=utilisateur,
+                titre=titre,
+                message=message,
+                canal=canal,
+                objet_lie=objet_lie,
+                donnees_supplementaires=donnees_supplementaires,
+                actions=actions
+            )
+            return
+        
+        en_attente.append(Notification(
+            utilisateur=utilisateur,
+            titre=titre,
+            message=message,
+            canal=canal,
+            content_type=ContentType.objects.get_for_model(objet_lie) if objet_lie else None,
+            object_id=objet_lie.pk if objet_lie else None,
+            donnees_supplementaires=donnees_supplementaires or {},
+            actions=actions or []
+        ))
+    
     @staticmethod
     @extend_schema(
         summary="Envoyer un lien de paiement KKIAPAY (email/SMS)",
@@ -0,0 +1,15 @@
+"""
+Signaux du module Notifications.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Notification
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalider_cache_recentes(sender, instance, **kwargs):
+    """Invalide le cache des notifications récentes du destinataire."""
+    cache.delete(Notification.cle_cache_recentes(instance.utilisateur_id))
@@ -1,3 +1,147 @@
+"""
+Tests du module Notifications.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .models import Notification
+from .services import NotificationService
+
+User = get_user_model()
+
+
+class NotificationRecentesTest(TestCase):
+    """Tests du cache des notifications récentes"""
+
+    def setUp(self):
+        self.addCleanup(cache.clear)
+        cache.clear()
+        self.user = User.objects.create_user(username="notifie", password="testpass123")
+        Notification.objects.create(utilisateur=self.user, titre="Première", message="...")
+
+    def test_recentes_mises_en_cache(self):
+        """Un second appel ne réinterroge pas la base"""
+        Notification.get_recentes(self.user)
+        with self.assertNumQueries(0):
+            recentes = Notification.get_recentes(self.user)
+        self.assertEqual([n.titre for n in recentes], ["Première"])
+        # Instances du modèle : le destinataire est chargé sans recharger la ligne
+        with self.assertNumQueries(1):
+            self.assertEqual(str(recentes[0]), "Première - notifie")
+        self.assertEqual(recentes[0].message, "...")
+
+    def test_cache_invalide_a_la_creation(self):
+        """Une nouvelle notification invalide le cache de son destinataire"""
+        Notification.get_recentes(self.user)
+        Notification.objects.create(utilisateur=self.user, titre="Seconde", message="...")
+        recentes = Notification.get_recentes(self.user)
+        self.assertEqual(len(recentes), 2)
+
+
+class NotificationServiceMasseTest(TestCase):
+    """Tests de la création de notifications en masse"""
+
+    def test_envoi_en_masse_en_un_insert(self):
+        """Une seule requête INSERT pour tous les destinataires"""
+        utilisateurs = [
+            User.objects.create_user(username=f"membre{i}", password="testpass123")
+            for i in range(3)
+        ]
+        with self.assertNumQueries(1):
+            notifications = NotificationService.envoyer_notifications_en_masse(
+                utilisateurs, titre="Rappel", message="Cotisation du jour"
+            )
+        self.assertEqual(len(notifications), 3)
+        self.assertEqual(Notification.objects.filter(titre="Rappel").count(), 3)
+
+    def test_echec_en_masse_propage(self):
+        """Une erreur d'insertion groupée est journalisée puis propagée"""
+        utilisateur = User.objects.create_user(username="refuse", password="testpass123")
+        with mock.patch.object(NotificationService, '_inserer_en_masse', side_effect=IntegrityError):
+            with self.assertLogs('notifications.services', level='ERROR'):
+                with self.assertRaises(IntegrityError):
+                    NotificationService.envoyer_notifications_en_masse(
+                        [utilisateur], titre="Rappel", message="..."
+                    )
+
+    def test_notifications_regroupees_en_un_insert(self):
+        """Les notifications mises en file sont créées ensemble après le commit"""
+        utilisateur = User.objects.create_user(username="groupe", password="testpass123")
+        with self.captureOnCommitCallbacks(execute=True):
+            with NotificationService.regrouper():
+                NotificationService.mettre_en_file(utilisateur, titre="Rappel 1", message="...")
+                NotificationService.mettre_en_file(utilisateur, titre="Rappel 2", message="...")
+                self.assertFalse(Notification.objects.filter(utilisateur=utilisateur).exists())
+        self.assertEqual(Notification.objects.filter(utilisateur=utilisateur).count(), 2)
+
+    def test_file_abandonnee_sur_erreur(self):
+        """Rien n'est créé si le bloc regroupé échoue"""
+        utilisateur = User.objects.create_user(username="echec", password="testpass123")
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError):
+                with NotificationService.regrouper():
+                    NotificationService.mettre_en_file(utilisateur, titre="Perdue", message="...")
+                    raise ValueError
+        self.assertFalse(Notification.objects.filter(utilisateur=utilisateur).exists())
+
+    def test_erreur_insertion_groupee_journalisee(self):
+        """Une erreur d'insertion au commit est journalisée sans remonter"""
+        utilisateur = User.objects.create_user(username="journal", password="testpass123")
+        with mock.patch.object(NotificationService, '_inserer_en_masse', side_effect=IntegrityError):
+            with self.assertLogs('notifications.services', level='ERROR'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    with NotificationService.regrouper():
+                        NotificationService.mettre_en_file(utilisateur, titre="Rappel", message="...")
+
+    def test_envoi_email_apres_commit(self):
+        """Les notifications email partent une fois la transaction validée"""
+        utilisateur = User.objects.create_user(username="abonne", password="testpass123")
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            notification = NotificationService.creer_notification(
+                utilisateur, titre="Reçu", message="Paiement confirmé", canal='email'
+            )
+            notification.refresh_from_db()
+            self.assertFalse(notification.envoye)
+        self.assertEqual(len(callbacks), 1)
+        notification.refresh_from_db()
+        self.assertTrue(notification.envoye)
+
+
+class NotificationViewSetTest(TestCase):
+    """Tests de l'API des notifications"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="lecteur", password="testpass123")
+        autre = User.objects.create_user(username="autre", password="testpass123")
+        Notification.objects.create(utilisateur=self.user, titre="A lire", message="...")
+        Notification.objects.create(utilisateur=autre, titre="Pas pour moi", message="...")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_seules_mes_notifications(self):
+        """La liste ne contient que les notifications de l'utilisateur connecté"""
+        response = self.client.get(reverse('notification-list'))
+        self.assertEqual(response.status_code, 200)
+        data = response.data['results'] if isinstance(response.data, dict) else response.data
+        self.assertEqual([n['titre'] for n in data], ["A lire"])
+
+    def test_marquer_toutes_lues(self):
+        """Toutes les notifications non lues sont marquées en une requête"""
+        response = self.client.post(reverse('notification-marquer-toutes-lues'))
+        self.assertEqual(response.data['notifications_mises_a_jour'], 1)
+        self.assertFalse(Notification.objects.filter(utilisateur=self.user, est_lue=False).exists())
 
-# Create your tests here.
+    def test_non_lues_sans_jointure(self):
+        """Le badge compte et liste les non lues sans jointure"""
+        with CaptureQueriesContext(connection) as requetes:
+            response = self.client.get(reverse('notification-non-lues'))
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual([n['titre'] for n in response.data['notifications']], ["A lire"])
+        self.assertFalse(any('JOIN' in q['sql'] for q in requetes.captured_queries))
@@ -1,13 +1,14 @@
 """
 Views Django REST Framework pour le module Notifications.
 """
+from django.utils import timezone
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiExample, OpenApiResponse
 
 from .models import Notification
-from .serializers import NotificationSerializer, NotificationCreateSerializer
+from .serializers import NotificationSerializer, NotificationCreateSerializer, NotificationBadgeSerializer
 
 
 @extend_schema_view(
@@ -157,33 +158,28 @@ class NotificationViewSet(viewsets.ModelViewSet):
     """
     queryset = Notification.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    
+    # Nombre maximal de notifications renvoyées par /non-lues/
+    NON_LUES_LIMITE = 50
 
     def get_serializer_class(self):
         if self.action == 'create':
             return NotificationCreateSerializer
         return NotificationSerializer
 
+    def _notifications_utilisateur(self):
+        """Notifications de l'utilisateur connecté, des plus récentes aux plus anciennes"""
+        # Chaque utilisateur ne voit que ses propres notifications (aucune requête de profil)
+        return Notification.objects.filter(
+            utilisateur=self.request.user
+        ).order_by('-date_creation')
+
     def get_queryset(self):
         """Filter notifications based on user"""
-        user = self.request.user
-        
-        # Chaque utilisateur ne voit que ses propres notifications
-        user_profile = None
-        if hasattr(user, 'clientsfd'):
-            user_profile = user.clientsfd
-        elif hasattr(user, 'agentsfd'):
-            user_profile = user.agentsfd
-        elif hasattr(user, 'superviseurssfd'):
-            user_profile = user.superviseurssfd
-        elif hasattr(user, 'administrateurssfd'):
-            user_profile = user.administrateurssfd
-        elif hasattr(user, 'adminplateforme'):
-            user_profile = user.adminplateforme
-        
-        if user_profile:
-            return Notification.objects.filter(destinataire=user_profile).order_by('-date_creation')
-        
-        return Notification.objects.none()
+        # Utilisateur et objets liés chargés en lot (évite le N+1 de objet_lie_nom)
+        return self._notifications_utilisateur().select_related(
+            'utilisateur', 'content_type'
+        ).prefetch_related('objet_lie')
 
     @extend_schema(
         summary="Marquer une notification comme lue",
@@ -286,11 +282,11 @@ class NotificationViewSet(viewsets.ModelViewSet):
         POST /api/notifications/marquer-toutes-lues/
         Marque toutes les notifications de l'utilisateur comme lues
         """
-        notifications = self.get_queryset().filter(est_lue=False)
-        count = notifications.count()
-        
-        for notification in notifications:
-            notification.marquer_comme_lue()
+        # Une seule requête UPDATE pour toutes les notifications non lues
+        count = self._notifications_utilisateur().filter(est_lue=False).update(
+            est_lue=True,
+            date_lecture=timezone.now()
+        )
         
         return Response({
             'success': True,
@@ -359,10 +355,14 @@ class NotificationViewSet(viewsets.ModelViewSet):
         GET /api/notifications/non-lues/
         Retourne les notifications non lues de l'utilisateur
         """
-        notifications = self.get_queryset().filter(est_lue=False)
-        serializer = NotificationSerializer(notifications, many=True)
+        # Champs du badge uniquement : pas de jointure ni de résolution de objet_lie
+        notifications = self._notifications_utilisateur().filter(
+            est_lue=False
+        ).only(*NotificationBadgeSerializer.Meta.fields)
         
         return Response({
             'count': notifications.count(),
-            'notifications': serializer.data
+            'notifications': NotificationBadgeSerializer(
+                notifications[:self.NON_LUES_LIMITE], many=True
+            ).data
         })
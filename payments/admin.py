@@ -6,6 +6,24 @@ from django.utils.html import format_html
 from .models import KKiaPayTransaction
 
 
+# Couleurs des badges de statut
+STATUS_COLORS = {
+    'pending': '#ffc107',     # Jaune
+    'processing': '#17a2b8',  # Bleu
+    'success': '#28a745',     # Vert
+    'failed': '#dc3545',      # Rouge
+    'cancelled': '#6c757d',   # Gris
+    'refunded': '#fd7e14',    # Orange
+}
+STATUS_BADGE_TEMPLATE = '<span style="color: {}; font-weight: bold;">●</span> {}'
+
+# Badges pré-rendus une fois pour toutes (libellés et couleurs sont statiques)
+STATUS_BADGES = {
+    value: format_html(STATUS_BADGE_TEMPLATE, STATUS_COLORS.get(value, '#6c757d'), label)
+    for value, label in KKiaPayTransaction.STATUS_CHOICES
+}
+
+
 @admin.register(KKiaPayTransaction)
 class KKiaPayTransactionAdmin(admin.ModelAdmin):
     """
@@ -72,21 +90,10 @@ class KKiaPayTransactionAdmin(admin.ModelAdmin):
     
     def status_badge(self, obj):
         """Badge coloré pour le statut"""
-        colors = {
-            'pending': '#ffc107',     # Jaune
-            'processing': '#17a2b8',  # Bleu
-            'success': '#28a745',     # Vert
-            'failed': '#dc3545',      # Rouge
-            'cancelled': '#6c757d',   # Gris
-            'refunded': '#fd7e14',    # Orange
-        }
-        
-        color = colors.get(obj.status, '#6c757d')
-        return format_html(
-            '<span style="color: {}; font-weight: bold;">●</span> {}',
-            color,
-            obj.get_status_display()
-        )
+        badge = STATUS_BADGES.get(obj.status)
+        if badge is None:
+            badge = format_html(STATUS_BADGE_TEMPLATE, '#6c757d', obj.get_status_display())
+        return badge
     status_badge.short_description = "Statut"
     status_badge.admin_order_field = 'status'
     
@@ -18,6 +18,13 @@ class KKiaPayConfig:
     Configuration centralisée pour KKiaPay
     """
     
+    # Attributs fixes : pas de __dict__ par instance, accès direct aux slots
+    __slots__ = (
+        'sandbox', 'public_key', 'private_key', 'secret_key', 'base_url',
+        'webhook_url', 'webhook_secret', 'timeout', 'max_retries', 'currency',
+        '_api_base',
+    )
+    
     def __init__(self):
         """Initialise la configuration KKiaPay"""
         self.sandbox = getattr(settings, 'KKIAPAY_SANDBOX', True)
@@ -31,6 +38,9 @@ class KKiaPayConfig:
         self.max_retries = getattr(settings, 'KKIAPAY_MAX_RETRIES', 3)
         self.currency = getattr(settings, 'KKIAPAY_CURRENCY', 'XOF')
         
+        # Base de l'API normalisée une seule fois
+        self._api_base = self.base_url.rstrip('/')
+        
         # Validation de la configuration
         self._validate_config()
     
@@ -56,9 +66,8 @@ class KKiaPayConfig:
     
     def get_api_url(self, endpoint=""):
         """Retourne l'URL complète de l'API KKiaPay"""
-        base = self.base_url.rstrip('/')
         endpoint = endpoint.lstrip('/')
-        return f"{base}/{endpoint}" if endpoint else base
+        return f"{self._api_base}/{endpoint}" if endpoint else self._api_base
     
     def __str__(self):
         mode = "SANDBOX" if self.sandbox else "LIVE"
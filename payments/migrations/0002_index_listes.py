@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-17 04:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kkiapaytransaction',
+            index=models.Index(fields=['status', 'created_at'], name='payments_kk_status_50e720_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kkiapaytransaction',
+            index=models.Index(fields=['user', 'created_at'], name='payments_kk_user_id_f5ed6b_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.1 on 2026-10-17 04:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_index_listes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kkiapaytransaction',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'processing'])), fields=['created_at'], name='kp_pending_idx'),
+        ),
+    ]
@@ -14,6 +14,20 @@ import uuid
 
 User = get_user_model()
 
+# Colonnes écrites par mark_as_success / mark_as_failed
+_UPDATE_FIELDS_SUCCESS = ('status', 'processed_at', 'updated_at')
+_UPDATE_FIELDS_FAILED = ('status', 'error_code', 'error_message', 'processed_at', 'updated_at')
+
+
+class KKiaPayTransactionManager(models.Manager):
+    """
+    Manager des transactions KKiaPay
+    """
+    
+    def with_user(self):
+        """Transactions avec leur utilisateur chargé par jointure (user_display des serializers)"""
+        return self.get_queryset().select_related('user')
+
 
 class KKiaPayTransaction(models.Model):
     """
@@ -22,7 +36,7 @@ class KKiaPayTransaction(models.Model):
     """
     
     # Types de transactions TontiFlex
-    TYPE_CHOICES = [
+    TYPE_CHOICES = (
         # Tontines
         ('adhesion_tontine', 'Frais d\'adhésion tontine'),
         ('cotisation_tontine', 'Cotisation tontine'),
@@ -38,17 +52,21 @@ class KKiaPayTransaction(models.Model):
         
         # Général
         ('autre', 'Autre'),
-    ]
+    )
     
     # Statuts de transaction
-    STATUS_CHOICES = [
+    STATUS_CHOICES = (
         ('pending', 'En attente'),
         ('processing', 'En cours de traitement'),
         ('success', 'Succès'),
         ('failed', 'Échec'),
         ('cancelled', 'Annulé'),
         ('refunded', 'Remboursé'),
-    ]
+    )
+    
+    # Groupes de statuts (is_pending / is_failed)
+    PENDING_STATUSES = frozenset(('pending', 'processing'))
+    FAILED_STATUSES = frozenset(('failed', 'cancelled'))
     
     # Identifiants
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -123,6 +141,8 @@ class KKiaPayTransaction(models.Model):
     webhook_received = models.BooleanField(default=False)
     webhook_data = models.JSONField(default=dict, blank=True)
     
+    objects = KKiaPayTransactionManager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -131,6 +151,15 @@ class KKiaPayTransaction(models.Model):
             models.Index(fields=['reference_kkiapay']),
             models.Index(fields=['type_transaction', 'status']),
             models.Index(fields=['created_at']),
+            # Listes admin/API filtrées puis triées par date
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['user', 'created_at']),
+            # Index partiel : seules les transactions encore en cours (suivi de statut)
+            models.Index(
+                fields=['created_at'],
+                name='kp_pending_idx',
+                condition=models.Q(status__in=['pending', 'processing'])
+            ),
         ]
         verbose_name = "Transaction KKiaPay"
         verbose_name_plural = "Transactions KKiaPay"
@@ -144,17 +173,17 @@ class KKiaPayTransaction(models.Model):
     
     def is_pending(self):
         """Vérifie si la transaction est en attente"""
-        return self.status in ['pending', 'processing']
+        return self.status in self.PENDING_STATUSES
     
     def is_failed(self):
         """Vérifie si la transaction a échoué"""
-        return self.status in ['failed', 'cancelled']
+        return self.status in self.FAILED_STATUSES
     
     def mark_as_success(self):
         """Marque la transaction comme réussie"""
         self.status = 'success'
         self.processed_at = timezone.now()
-        self.save(update_fields=['status', 'processed_at', 'updated_at'])
+        self.save(update_fields=_UPDATE_FIELDS_SUCCESS)
     
     def mark_as_failed(self, error_code="", error_message=""):
         """Marque la transaction comme échouée"""
@@ -162,16 +191,14 @@ class KKiaPayTransaction(models.Model):
         self.error_code = error_code
         self.error_message = error_message
         self.processed_at = timezone.now()
-        self.save(update_fields=['status', 'error_code', 'error_message', 'processed_at', 'updated_at'])
+        self.save(update_fields=_UPDATE_FIELDS_FAILED)
     
     def generate_reference(self):
         """Génère une référence unique TontiFlex"""
         if not self.reference_tontiflex:
-            import random
-            timestamp = timezone.now().strftime('%Y%m%d%H%M%S')
+            # 48 bits aléatoires : collisions négligeables (unicité garantie en base)
             type_prefix = self.type_transaction[:3].upper()
-            random_id = str(random.randint(1000, 9999))
-            self.reference_tontiflex = f"TF{type_prefix}{timestamp}{random_id}"
+            self.reference_tontiflex = f"TF{type_prefix}{uuid.uuid4().hex[:12].upper()}"
     
     def save(self, *args, **kwargs):
         """Override save pour générer la référence automatiquement"""
@@ -1,18 +1,44 @@
 """
 Serializers pour le module Payments KKiaPay
 """
+import re
 from rest_framework import serializers
 from decimal import Decimal
+from .config import kkiapay_config
 from .models import KKiaPayTransaction
 
 
+# Tout caractère non numérique (espaces, '+', tirets...)
+_NON_DIGIT_RE = re.compile(r'\D')
+
+# Libellés des choix, calculés une fois pour les listes de transactions
+_STATUS_DISPLAY = dict(KKiaPayTransaction.STATUS_CHOICES)
+_TYPE_DISPLAY = dict(KKiaPayTransaction.TYPE_CHOICES)
+
+
+def _validate_phone(value):
+    """
+    Vérifie qu'un numéro de téléphone contient entre 8 et 15 chiffres
+    """
+    # Supprimer les espaces et caractères spéciaux
+    clean_number = _NON_DIGIT_RE.sub('', value)
+    if not 8 <= len(clean_number) <= 15:
+        raise serializers.ValidationError(
+            "Le numéro de téléphone doit contenir entre 8 et 15 chiffres"
+        )
+    return value
+
+
 class KKiaPayTransactionSerializer(serializers.ModelSerializer):
     """
     Serializer pour afficher les transactions KKiaPay
+    
+    Les listes doivent partir de KKiaPayTransaction.objects.with_user()
+    (user_display lit user.username pour chaque ligne).
     """
     
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
-    type_display = serializers.CharField(source='get_type_transaction_display', read_only=True)
+    status_display = serializers.SerializerMethodField()
+    type_display = serializers.SerializerMethodField()
     is_success = serializers.BooleanField(read_only=True)
     is_pending = serializers.BooleanField(read_only=True)
     user_display = serializers.CharField(source='user.username', read_only=True)
@@ -30,6 +56,14 @@ class KKiaPayTransactionSerializer(serializers.ModelSerializer):
             'id', 'reference_tontiflex', 'reference_kkiapay', 'status',
             'created_at', 'updated_at', 'processed_at'
         ]
+    
+    def get_status_display(self, obj) -> str:
+        """Libellé du statut"""
+        return _STATUS_DISPLAY.get(obj.status, obj.status)
+    
+    def get_type_display(self, obj) -> str:
+        """Libellé du type de transaction"""
+        return _TYPE_DISPLAY.get(obj.type_transaction, obj.type_transaction)
 
 
 class PaymentInitiationSerializer(serializers.Serializer):
@@ -73,16 +107,7 @@ class PaymentInitiationSerializer(serializers.Serializer):
         """
         Valide le format du numéro de téléphone
         """
-        # Supprimer les espaces et caractères spéciaux
-        clean_number = ''.join(filter(str.isdigit, value.replace('+', '')))
-        
-        # Vérification de la longueur (8 à 15 chiffres)
-        if len(clean_number) < 8 or len(clean_number) > 15:
-            raise serializers.ValidationError(
-                "Le numéro de téléphone doit contenir entre 8 et 15 chiffres"
-            )
-        
-        return value
+        return _validate_phone(value)
 
 
 class PaymentStatusSerializer(serializers.Serializer):
@@ -101,11 +126,11 @@ class SandboxTestSerializer(serializers.Serializer):
     Serializer pour les tests en mode SANDBOX
     """
     
-    SCENARIO_CHOICES = [
+    SCENARIO_CHOICES = (
         ('success', 'Test de succès'),
         ('failure', 'Test d\'échec'),
         ('timeout', 'Test de timeout'),
-    ]
+    )
     
     scenario = serializers.ChoiceField(
         choices=SCENARIO_CHOICES,
@@ -122,8 +147,6 @@ class SandboxTestSerializer(serializers.Serializer):
     
     def validate(self, data):
         """Validation globale pour les tests sandbox"""
-        from .config import kkiapay_config
-        
         if not kkiapay_config.sandbox:
             raise serializers.ValidationError(
                 "Les tests ne sont disponibles qu'en mode SANDBOX"
@@ -183,13 +206,4 @@ class GeneratePaymentLinkSerializer(serializers.Serializer):
         """
         Valide le format du numéro de téléphone
         """
-        # Supprimer les espaces et caractères spéciaux
-        clean_number = ''.join(filter(str.isdigit, value.replace('+', '')))
-        
-        # Vérification de la longueur (8 à 15 chiffres)
-        if len(clean_number) < 8 or len(clean_number) > 15:
-            raise serializers.ValidationError(
-                "Le numéro de téléphone doit contenir entre 8 et 15 chiffres"
-            )
-        
-        return value
+        return _validate_phone(value)
@@ -10,10 +10,15 @@ SDK Python : https://github.com/PythonBenin/kkiapay-python
 """
 import logging
 # import requests  # Importé à la demande pour éviter les conflits de version
+import time
+import jwt
+import orjson
 from decimal import Decimal
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlencode
 from django.utils import timezone
 from django.conf import settings
+from django.core.cache import cache
 
 from .config import kkiapay_config
 from .models import KKiaPayTransaction
@@ -29,17 +34,55 @@ class KKiaPayException(Exception):
         self.response_data = response_data or {}
 
 
+# Module requests, importé au premier usage (voir _get_requests)
+_requests = None
+
+
+def _get_requests():
+    """Importe requests à la demande pour éviter les conflits de version au démarrage"""
+    global _requests
+    if _requests is None:
+        try:
+            import requests
+        except ImportError as e:
+            logger.error("❌ Impossible d'importer requests: %s", e)
+            raise KKiaPayException("Module requests requis non disponible")
+        _requests = requests
+    return _requests
+
+
+# Classe Retry à attente Retry-After plafonnée, créée au premier usage (voir _get_retry_class)
+_retry_class = None
+
+
+def _get_retry_class():
+    """Construit la classe Retry de la session KKiaPay (import urllib3 à la demande)"""
+    global _retry_class
+    if _retry_class is None:
+        from urllib3.util.retry import Retry
+
+        class KKiaPayRetry(Retry):
+            """Retry dont l'attente Retry-After est plafonnée pour borner la durée d'un appel"""
+
+            def get_retry_after(self, response):
+                retry_after = super().get_retry_after(response)
+                if retry_after is None:
+                    return None
+                return min(retry_after, KKiaPayService.RETRY_AFTER_MAX)
+
+        _retry_class = KKiaPayRetry
+    return _retry_class
+
+
 class KKiaPayService:
     def create_payment_token(self, transaction_id, expires_in=86400):
         """
         Crée un token JWT temporaire pour un lien de paiement sécurisé (valide 24h par défaut)
         """
-        import jwt
-        from datetime import datetime, timedelta
         secret = self.config.secret_key
         payload = {
             'transaction_id': str(transaction_id),
-            'exp': datetime.utcnow() + timedelta(seconds=expires_in)
+            'exp': int(time.time()) + expires_in
         }
         return jwt.encode(payload, secret, algorithm='HS256')
 
@@ -47,7 +90,6 @@ class KKiaPayService:
         """
         Valide un token JWT de paiement et retourne le transaction_id s'il est valide
         """
-        import jwt
         secret = self.config.secret_key
         try:
             payload = jwt.decode(token, secret, algorithms=['HS256'])
@@ -65,26 +107,82 @@ class KKiaPayService:
         base_url = self.config.payment_widget_url if hasattr(self.config, 'payment_widget_url') and self.config.payment_widget_url else '/payments/widget/'
         url = f"{base_url}?token={token}"
         if return_url:
-            from urllib.parse import urlencode
             url += f"&{urlencode({'return_url': return_url})}"
         return url
     """
     Service centralisé pour toutes les opérations KKiaPay
     """
+
+    # Statuts KKiaPay (normalisés en majuscules) → statuts internes
+    _STATUS_MAPPING = {
+        'PENDING': 'pending',
+        'PROCESSING': 'processing',
+        'SUCCESS': 'success',
+        'SUCCESSFUL': 'success',
+        'FAILED': 'failed',
+        'CANCELLED': 'cancelled',
+        'REFUNDED': 'refunded',
+    }
+
+    # Statuts internes qui n'évoluent plus côté KKiaPay
+    _FINAL_STATUSES = frozenset(('success', 'failed', 'cancelled', 'refunded'))
+
+    # Relances HTTP : facteur de backoff et attente Retry-After maximale (secondes)
+    RETRY_BACKOFF_FACTOR = 0.3
+    RETRY_AFTER_MAX = 30
+
+    # Durée maximale du verrou de vérification de statut (secondes), alignée
+    # sur le timeout par défaut des workers gunicorn
+    STATUS_LOCK_MAX_TTL = 30
+
+    # Champs mis à jour après l'acceptation d'un paiement par KKiaPay
+    _INITIATION_FIELDS = ('reference_kkiapay', 'kkiapay_response', 'status', 'updated_at')
+
+    # Champs obligatoires d'un webhook KKiaPay
+    _WEBHOOK_REQUIRED_FIELDS = frozenset(('status', 'transactionId'))
+
+    # Traitements en masse : lignes par requête SQL et champs mis à jour
+    BULK_BATCH_SIZE = 1000
+    _BULK_STATUS_FIELDS = (
+        'reference_kkiapay', 'kkiapay_response', 'status',
+        'error_code', 'error_message', 'processed_at', 'updated_at',
+    )
     
     def __init__(self):
         """Initialise le service KKiaPay"""
-        # Import à la demande pour éviter les conflits de version au démarrage
-        try:
-            import requests
-            self.requests = requests
-        except ImportError as e:
-            logger.error(f"❌ Impossible d'importer requests: {e}")
-            raise KKiaPayException("Module requests requis non disponible")
+        self.requests = _get_requests()
         
         self.config = kkiapay_config
         self.session = self.requests.Session()
-        
+
+        # Pool de connexions keep-alive + relances sur erreurs passerelle et
+        # limitation de débit (Retry-After respecté, plafonné à RETRY_AFTER_MAX).
+        # Les POST ne sont pas rejoués : un paiement n'est pas idempotent.
+        from requests.adapters import HTTPAdapter
+        retry_class = _get_retry_class()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=retry_class(
+                total=self.config.max_retries,
+                backoff_factor=self.RETRY_BACKOFF_FACTOR,
+                status_forcelist=(429, 502, 503, 504),
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Durée maximale d'un appel API, relances comprises : chaque tentative
+        # peut attendre la connexion puis la lecture, chaque relance dort au plus
+        # max(Retry-After plafonné, backoff)
+        retries = self.config.max_retries
+        max_sleep = max(
+            self.RETRY_AFTER_MAX,
+            min(retry_class.BACKOFF_MAX, self.RETRY_BACKOFF_FACTOR * 2 ** max(retries - 1, 0))
+        )
+        self._max_request_duration = (retries + 1) * 2 * self.config.timeout + retries * max_sleep
+
         # Headers par défaut
         self.session.headers.update({
             'Content-Type': 'application/json',
@@ -98,7 +196,7 @@ class KKiaPayService:
             logger.error("❌ Configuration KKiaPay incomplète")
             raise KKiaPayException("Configuration KKiaPay manquante")
         
-        logger.info(f"✅ Service KKiaPay initialisé en mode {'SANDBOX' if self.config.sandbox else 'LIVE'}")
+        logger.info("✅ Service KKiaPay initialisé en mode %s", 'SANDBOX' if self.config.sandbox else 'LIVE')
     
     def initiate_payment(self, 
                         user,
@@ -123,9 +221,10 @@ class KKiaPayService:
         Returns:
             KKiaPayTransaction: Transaction créée
         """
-        logger.info(f"🚀 Initiation paiement KKiaPay: {amount} XOF pour {user.username}")
+        logger.info("🚀 Initiation paiement KKiaPay: %s XOF pour %s", amount, user.username)
         
-        # Création de la transaction en base
+        # Transaction enregistrée avant l'appel API : trace de rapprochement
+        # même si le processus s'arrête pendant la requête
         transaction = KKiaPayTransaction.objects.create(
             user=user,
             montant=amount,
@@ -138,43 +237,131 @@ class KKiaPayService:
         )
         
         try:
-            # Données pour l'API KKiaPay
-            payment_data = {
-                'amount': str(amount),
-                'phone': phone_number,
-                'sandbox': self.config.sandbox,
-                'reason': description or f"TontiFlex - {transaction.get_type_transaction_display()}",
-                'webhook': self.config.webhook_url,
-                'data': {
-                    'transaction_id': str(transaction.id),
-                    'reference': transaction.reference_tontiflex,
-                    'user_id': user.id,
-                    'type': transaction_type
-                }
-            }
-            
             # Appel à l'API KKiaPay
-            response = self._make_api_request('POST', '/payment', payment_data)
-            
-            # Mise à jour de la transaction avec la réponse
-            transaction.reference_kkiapay = response.get('transactionId', '')
-            transaction.kkiapay_response = response
-            transaction.status = 'processing'
-            transaction.save()
-            
-            logger.info(f"✅ Paiement initié avec succès: {transaction.reference_tontiflex}")
-            return transaction
-            
+            response = self._make_api_request('POST', '/payment', self._build_payment_data(transaction))
         except Exception as e:
             # Marquer la transaction comme échouée
             error_msg = str(e)
-            logger.error(f"❌ Erreur initiation paiement: {error_msg}")
+            logger.error("❌ Erreur initiation paiement: %s", error_msg)
             
             transaction.mark_as_failed(
                 error_code="INITIATION_ERROR",
                 error_message=error_msg
             )
             raise
+        
+        # Mise à jour de la transaction avec la réponse
+        transaction.reference_kkiapay = response.get('transactionId', '')
+        transaction.kkiapay_response = response
+        transaction.status = 'processing'
+        try:
+            transaction.save(update_fields=self._INITIATION_FIELDS)
+        except Exception as e:
+            # Le paiement est déjà accepté par KKiaPay : tracer sa référence
+            # pour pouvoir le rapprocher de la transaction en attente
+            logger.error(
+                "❌ Paiement accepté par KKiaPay mais non enregistré: %s (KKiaPay %s): %s",
+                transaction.reference_tontiflex, transaction.reference_kkiapay, e
+            )
+            raise
+        
+        logger.info("✅ Paiement initié avec succès: %s", transaction.reference_tontiflex)
+        return transaction
+    
+    def bulk_initiate_payments(self, specs: List[Dict[str, Any]]) -> List[KKiaPayTransaction]:
+        """
+        Initie plusieurs paiements KKiaPay (ex: cotisations de tout un groupe)
+        
+        Les transactions sont insérées puis mises à jour par lots : deux séries
+        de requêtes SQL pour l'ensemble au lieu de deux requêtes par paiement.
+        Un échec d'appel API marque la transaction concernée comme échouée
+        sans interrompre les autres.
+        
+        Args:
+            specs: Paramètres de chaque paiement, avec les clés de initiate_payment
+                   (user, amount, phone_number, transaction_type, description,
+                   object_id, object_type)
+            
+        Returns:
+            List[KKiaPayTransaction]: Transactions créées, dans l'ordre des specs
+        """
+        logger.info("🚀 Initiation de %d paiements KKiaPay", len(specs))
+        
+        transactions = []
+        for spec in specs:
+            transaction = KKiaPayTransaction(
+                user=spec['user'],
+                montant=spec['amount'],
+                numero_telephone=spec['phone_number'],
+                type_transaction=spec['transaction_type'],
+                description=spec.get('description', ''),
+                objet_id=spec.get('object_id'),
+                objet_type=spec.get('object_type', ''),
+                status='pending'
+            )
+            # bulk_create ne passe pas par save() : référence générée ici
+            transaction.generate_reference()
+            transactions.append(transaction)
+        
+        KKiaPayTransaction.objects.bulk_create(transactions, batch_size=self.BULK_BATCH_SIZE)
+        
+        for transaction in transactions:
+            try:
+                response = self._make_api_request('POST', '/payment', self._build_payment_data(transaction))
+                transaction.reference_kkiapay = response.get('transactionId', '')
+                transaction.kkiapay_response = response
+                transaction.status = 'processing'
+            except Exception as e:
+                logger.error("❌ Erreur initiation paiement %s: %s", transaction.reference_tontiflex, e)
+                transaction.status = 'failed'
+                transaction.error_code = "INITIATION_ERROR"
+                transaction.error_message = str(e)
+                transaction.processed_at = timezone.now()
+        
+        self.bulk_update_statuses(transactions)
+        return transactions
+    
+    def bulk_update_statuses(self, transactions: List[KKiaPayTransaction]) -> None:
+        """
+        Enregistre par lots les changements de statut de plusieurs transactions
+        
+        Args:
+            transactions: Transactions modifiées en mémoire
+        """
+        # bulk_update ne déclenche pas auto_now
+        now = timezone.now()
+        for transaction in transactions:
+            transaction.updated_at = now
+        
+        KKiaPayTransaction.objects.bulk_update(
+            transactions,
+            self._BULK_STATUS_FIELDS,
+            batch_size=self.BULK_BATCH_SIZE
+        )
+    
+    def _build_payment_data(self, transaction: KKiaPayTransaction) -> Dict:
+        """
+        Construit le corps de la requête d'initiation de paiement
+        
+        Args:
+            transaction: Transaction à payer
+            
+        Returns:
+            Dict: Données pour l'API KKiaPay
+        """
+        return {
+            'amount': str(transaction.montant),
+            'phone': transaction.numero_telephone,
+            'sandbox': self.config.sandbox,
+            'reason': transaction.description or f"TontiFlex - {transaction.get_type_transaction_display()}",
+            'webhook': self.config.webhook_url,
+            'data': {
+                'transaction_id': str(transaction.id),
+                'reference': transaction.reference_tontiflex,
+                'user_id': transaction.user_id,
+                'type': transaction.type_transaction
+            }
+        }
     
     def check_transaction_status(self, transaction: KKiaPayTransaction) -> bool:
         """
@@ -187,9 +374,25 @@ class KKiaPayService:
             bool: True si le statut a changé
         """
         if not transaction.reference_kkiapay:
-            logger.warning(f"⚠️ Pas de référence KKiaPay pour {transaction.reference_tontiflex}")
+            logger.warning("⚠️ Pas de référence KKiaPay pour %s", transaction.reference_tontiflex)
             return False
         
+        # Statut final déjà connu : inutile d'interroger KKiaPay
+        # (un éventuel remboursement arrive par webhook)
+        if transaction.status in self._FINAL_STATUSES:
+            return False
+        
+        # Une seule vérification en vol par référence (double clic, webhook
+        # concurrent...) : les autres appelants relisent l'état en base.
+        # Le verrou ne survit pas longtemps à un worker tué en cours d'appel.
+        lock_key = f"kkiapay:status_check:{transaction.reference_kkiapay}"
+        lock_ttl = min(self._max_request_duration, self.STATUS_LOCK_MAX_TTL)
+        if not cache.add(lock_key, 1, timeout=lock_ttl):
+            logger.debug("⏳ Vérification déjà en cours: %s", transaction.reference_tontiflex)
+            old_status = transaction.status
+            transaction.refresh_from_db()
+            return transaction.status != old_status
+        
         try:
             # Appel à l'API de vérification
             response = self._make_api_request(
@@ -204,24 +407,30 @@ class KKiaPayService:
             if new_status != old_status:
                 transaction.status = new_status
                 transaction.kkiapay_response.update(response)
+                update_fields = ['status', 'kkiapay_response', 'updated_at']
                 
                 if new_status == 'success':
                     transaction.processed_at = timezone.now()
-                elif new_status in ['failed', 'cancelled']:
+                    update_fields.append('processed_at')
+                elif new_status in transaction.FAILED_STATUSES:
                     transaction.error_code = response.get('error_code', 'UNKNOWN')
                     transaction.error_message = response.get('error_message', 'Erreur inconnue')
                     transaction.processed_at = timezone.now()
+                    update_fields.extend(('error_code', 'error_message', 'processed_at'))
                 
-                transaction.save()
+                # Seules les colonnes modifiées sont réécrites
+                transaction.save(update_fields=update_fields)
                 
-                logger.info(f"📊 Statut mis à jour: {transaction.reference_tontiflex} {old_status} → {new_status}")
+                logger.info("📊 Statut mis à jour: %s %s → %s", transaction.reference_tontiflex, old_status, new_status)
                 return True
             
             return False
             
         except Exception as e:
-            logger.error(f"❌ Erreur vérification statut: {str(e)}")
+            logger.error("❌ Erreur vérification statut: %s", e)
             return False
+        finally:
+            cache.delete(lock_key)
     
     def process_webhook(self, webhook_data: Dict) -> Optional[KKiaPayTransaction]:
         """
@@ -256,24 +465,28 @@ class KKiaPayService:
             transaction.status = new_status
             transaction.webhook_received = True
             transaction.webhook_data = webhook_data
+            update_fields = ['status', 'webhook_received', 'webhook_data', 'updated_at']
             
             if new_status == 'success':
                 transaction.processed_at = timezone.now()
-            elif new_status in ['failed', 'cancelled']:
+                update_fields.append('processed_at')
+            elif new_status in transaction.FAILED_STATUSES:
                 transaction.error_code = webhook_data.get('error_code', 'WEBHOOK_ERROR')
                 transaction.error_message = webhook_data.get('message', 'Erreur webhook')
                 transaction.processed_at = timezone.now()
+                update_fields.extend(('error_code', 'error_message', 'processed_at'))
             
-            transaction.save()
+            # kkiapay_response et les autres colonnes JSON ne sont pas réécrites
+            transaction.save(update_fields=update_fields)
             
-            logger.info(f"✅ Webhook traité: {transaction.reference_tontiflex} {old_status} → {new_status}")
+            logger.info("✅ Webhook traité: %s %s → %s", transaction.reference_tontiflex, old_status, new_status)
             return transaction
             
         except KKiaPayTransaction.DoesNotExist:
-            logger.error(f"❌ Transaction introuvable: {transaction_id}")
+            logger.error("❌ Transaction introuvable: %s", transaction_id)
             return None
         except Exception as e:
-            logger.error(f"❌ Erreur traitement webhook: {str(e)}")
+            logger.error("❌ Erreur traitement webhook: %s", e)
             return None
     
     def _make_api_request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
@@ -290,38 +503,63 @@ class KKiaPayService:
         """
         url = self.config.get_api_url(endpoint)
         
+        exceptions = self.requests.exceptions
         try:
+            # Sérialisation orjson (Content-Type JSON déjà dans les headers de session)
             response = self.session.request(
                 method=method,
                 url=url,
-                json=data,
+                data=orjson.dumps(data) if data is not None else None,
                 timeout=self.config.timeout
             )
+        except exceptions.Timeout as e:
+            # Délai dépassé : distingué pour permettre un nouvel essai rapide
+            logger.error("⏱️ Délai dépassé KKiaPay: %s", e)
+            raise KKiaPayException(f"Délai dépassé: {str(e)}", error_code="TIMEOUT") from e
+        except exceptions.RequestException as e:
+            # Autres erreurs réseau (connexion, retries épuisés, etc.)
+            logger.error("❌ Erreur réseau KKiaPay: %s", e)
+            raise KKiaPayException(f"Erreur réseau: {str(e)}", error_code="NETWORK_ERROR") from e
+        
+        # Log de la requête
+        logger.debug("📡 %s %s - Status: %s", method, url, response.status_code)
+        
+        # Gestion des erreurs HTTP
+        if not response.ok:
+            error_data = self._parse_error_response(response)
+            error_message = error_data.get('message', f'Erreur HTTP {response.status_code}')
             
-            # Log de la requête
-            logger.debug(f"📡 {method} {url} - Status: {response.status_code}")
-            
-            # Gestion des erreurs HTTP
-            if not response.ok:
-                error_data = response.json() if response.content else {}
-                error_message = error_data.get('message', f'Erreur HTTP {response.status_code}')
-                
-                logger.error(f"❌ Erreur API KKiaPay: {error_message}")
-                raise KKiaPayException(
-                    error_message,
-                    error_code=str(response.status_code),
-                    response_data=error_data
-                )
-            
-            return response.json()
+            logger.error("❌ Erreur API KKiaPay: %s", error_message)
+            raise KKiaPayException(
+                error_message,
+                error_code=str(response.status_code),
+                response_data=error_data
+            )
+        
+        # Corps vide (ex: 204) : rien à décoder
+        return orjson.loads(response.content) if response.content else {}
+    
+    def _parse_error_response(self, response) -> Dict:
+        """
+        Décode le corps d'une réponse d'erreur KKiaPay en une seule passe
+        
+        Args:
+            response: Réponse HTTP en erreur
             
-        except Exception as e:
-            # Gestion des erreurs réseau (RequestException, etc.)
-            if 'requests' in str(type(e).__module__):
-                logger.error(f"❌ Erreur réseau KKiaPay: {str(e)}")
-                raise KKiaPayException(f"Erreur réseau: {str(e)}", error_code="NETWORK_ERROR")
-            else:
-                raise
+        Returns:
+            Dict: Corps JSON, ou extrait brut si la passerelle renvoie autre chose
+        """
+        if not response.content:
+            return {}
+        try:
+            error_data = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # Page HTML d'un proxy/passerelle (502, 504...) : extrait tronqué
+            return {
+                'message': f'Erreur HTTP {response.status_code}',
+                'raw': response.content[:200].decode('utf-8', errors='replace')
+            }
+        return error_data if isinstance(error_data, dict) else {'detail': error_data}
     
     def _map_kkiapay_status(self, kkiapay_status: str) -> str:
         """
@@ -333,17 +571,11 @@ class KKiaPayService:
         Returns:
             str: Statut interne correspondant
         """
-        status_mapping = {
-            'PENDING': 'pending',
-            'PROCESSING': 'processing',
-            'SUCCESS': 'success',
-            'SUCCESSFUL': 'success',
-            'FAILED': 'failed',
-            'CANCELLED': 'cancelled',
-            'REFUNDED': 'refunded',
-        }
-        
-        return status_mapping.get(kkiapay_status.upper(), 'pending')
+        # Cas courant : statut déjà en majuscules, sans normalisation
+        status = self._STATUS_MAPPING.get(kkiapay_status)
+        if status is None:
+            status = self._STATUS_MAPPING.get(kkiapay_status.strip().upper(), 'pending')
+        return status
     
     def _validate_webhook(self, webhook_data: Dict) -> bool:
         """
@@ -356,9 +588,10 @@ class KKiaPayService:
             bool: True si valide
         """
         # TODO: Implémenter la validation de signature
-        # Pour l'instant, validation basique
-        required_fields = ['status', 'transactionId']
-        return all(field in webhook_data for field in required_fields)
+        # KKiaPayWebhookView._validate_signature accepte encore les webhooks
+        # sans secret configuré ou sans header X-KKiaPay-Signature :
+        # pour l'instant, validation basique des champs obligatoires
+        return self._WEBHOOK_REQUIRED_FIELDS.issubset(webhook_data)
 
 
 # Instance globale du service (sera initialisée à la demande)
@@ -371,5 +604,18 @@ def get_kkiapay_service():
         _kkiapay_service = KKiaPayService()
     return _kkiapay_service
 
-# Alias pour compatibilité
-kkiapay_service = get_kkiapay_service
+
+
+class _KKiaPayServiceProxy:
+    """
+    Alias paresseux vers l'instance partagée : le service (et sa validation de
+    configuration) n'est créé qu'au premier appel, pas à l'import des vues.
+    """
+    __slots__ = ()
+    
+    def __getattr__(self, name):
+        return getattr(get_kkiapay_service(), name)
+
+
+# Alias pour compatibilité : ``from .services import kkiapay_service``
+kkiapay_service = _KKiaPayServiceProxy()
@@ -11,7 +11,7 @@ from decimal import Decimal
 from django.db import transaction
 from django.utils import timezone
 from .models import KKiaPayTransaction
-from .services import KKiaPayService
+from .services import get_kkiapay_service
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ class MigrationService:
     """
     
     def __init__(self):
-        self.kkiapay_service = KKiaPayService()
+        self.kkiapay_service = get_kkiapay_service()
     
     @transaction.atomic
     def create_tontine_withdrawal_transaction(self, retrait_data):
@@ -56,11 +56,11 @@ class MigrationService:
                 description=retrait_data.get('description', f"Retrait tontine - {reference}")
             )
             
-            logger.info(f"Transaction KKiaPay créée pour retrait: {reference}")
+            logger.info("Transaction KKiaPay créée pour retrait: %s", reference)
             return transaction_kkia
             
         except Exception as e:
-            logger.error(f"Erreur création transaction retrait: {e}")
+            logger.error("Erreur création transaction retrait: %s", e)
             raise
     
     @transaction.atomic
@@ -99,11 +99,11 @@ class MigrationService:
                 }
             )
             
-            logger.info(f"Transaction KKiaPay créée pour adhésion: {reference}")
+            logger.info("Transaction KKiaPay créée pour adhésion: %s", reference)
             return transaction_kkia
             
         except Exception as e:
-            logger.error(f"Erreur création transaction adhésion: {e}")
+            logger.error("Erreur création transaction adhésion: %s", e)
             raise
 
     @transaction.atomic
@@ -131,11 +131,11 @@ class MigrationService:
                 description=cotisation_data.get('description', f"Cotisation tontine - {reference}")
             )
             
-            logger.info(f"Transaction KKiaPay créée pour cotisation: {reference}")
+            logger.info("Transaction KKiaPay créée pour cotisation: %s", reference)
             return transaction_kkia
             
         except Exception as e:
-            logger.error(f"Erreur création transaction cotisation: {e}")
+            logger.error("Erreur création transaction cotisation: %s", e)
             raise
     
     @transaction.atomic
@@ -164,11 +164,11 @@ class MigrationService:
                 description=epargne_data.get('description', f"Transaction épargne - {reference}")
             )
             
-            logger.info(f"Transaction KKiaPay créée pour épargne: {reference}")
+            logger.info("Transaction KKiaPay créée pour épargne: %s", reference)
             return transaction_kkia
             
         except Exception as e:
-            logger.error(f"Erreur création transaction épargne: {e}")
+            logger.error("Erreur création transaction épargne: %s", e)
             raise
     
     def initiate_payment(self, transaction_kkia):
@@ -199,18 +199,18 @@ class MigrationService:
                 transaction_kkia.kkiapay_response = result
                 transaction_kkia.save()
                 
-                logger.info(f"Paiement KKiaPay initié: {transaction_kkia.reference_tontiflex}")
+                logger.info("Paiement KKiaPay initié: %s", transaction_kkia.reference_tontiflex)
             else:
                 transaction_kkia.status = 'failed'
                 transaction_kkia.message_erreur = result.get('error', 'Erreur inconnue')
                 transaction_kkia.save()
                 
-                logger.error(f"Échec initiation paiement: {result.get('error')}")
+                logger.error("Échec initiation paiement: %s", result.get('error'))
             
             return result
             
         except Exception as e:
-            logger.error(f"Erreur initiation paiement KKiaPay: {e}")
+            logger.error("Erreur initiation paiement KKiaPay: %s", e)
             transaction_kkia.status = 'failed'
             transaction_kkia.message_erreur = str(e)
             transaction_kkia.save()
@@ -250,12 +250,12 @@ class MigrationService:
                 transaction_kkia.kkiapay_response = result
                 transaction_kkia.save()
                 
-                logger.info(f"Statut transaction vérifié: {transaction_kkia.reference_tontiflex} -> {status}")
+                logger.info("Statut transaction vérifié: %s -> %s", transaction_kkia.reference_tontiflex, status)
             
             return result
             
         except Exception as e:
-            logger.error(f"Erreur vérification transaction: {e}")
+            logger.error("Erreur vérification transaction: %s", e)
             raise
 
 
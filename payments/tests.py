@@ -0,0 +1,178 @@
+"""
+Tests du service KKiaPay.
+Les appels HTTP vers KKiaPay sont simulés (aucun accès réseau).
+"""
+
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from payments.config import kkiapay_config
+from payments.models import KKiaPayTransaction
+from payments import services
+from payments.services import KKiaPayService, kkiapay_service
+
+User = get_user_model()
+
+
+class KKiaPayServiceStatusTest(TestCase):
+    """Tests de la vérification de statut auprès de KKiaPay"""
+
+    def setUp(self):
+        """Préparation du service et d'une transaction en cours"""
+        patcher = mock.patch.multiple(
+            kkiapay_config,
+            public_key='pk_test',
+            private_key='pv_test',
+            secret_key='sk_test'
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(cache.clear)
+
+        self.service = KKiaPayService()
+        self.user = User.objects.create_user(username="payeur", password="testpass123")
+        self.transaction = KKiaPayTransaction.objects.create(
+            user=self.user,
+            montant=Decimal('5000.00'),
+            numero_telephone='+22997000001',
+            type_transaction='cotisation_tontine',
+            reference_kkiapay='KKP-123',
+            status='processing'
+        )
+
+    def test_statut_mis_a_jour(self):
+        """Un nouveau statut KKiaPay est enregistré sur la transaction"""
+        with mock.patch.object(self.service, '_make_api_request', return_value={'status': 'SUCCESS'}) as api:
+            self.assertTrue(self.service.check_transaction_status(self.transaction))
+
+        api.assert_called_once()
+        self.transaction.refresh_from_db()
+        self.assertEqual(self.transaction.status, 'success')
+        self.assertIsNotNone(self.transaction.processed_at)
+
+    def test_webhook_met_a_jour_le_statut(self):
+        """Un webhook de succès enregistre le statut et les données reçues"""
+        webhook = {
+            'status': 'SUCCESS',
+            'transactionId': 'KKP-123',
+            'data': {'transaction_id': str(self.transaction.id)}
+        }
+        transaction = self.service.process_webhook(webhook)
+
+        self.assertIsNotNone(transaction)
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.status, 'success')
+        self.assertTrue(transaction.webhook_received)
+        self.assertEqual(transaction.webhook_data, webhook)
+
+    def test_statut_final_sans_appel_api(self):
+        """Une transaction dans un statut final n'est pas revérifiée"""
+        self.transaction.status = 'success'
+        with mock.patch.object(self.service, '_make_api_request') as api:
+            self.assertFalse(self.service.check_transaction_status(self.transaction))
+        api.assert_not_called()
+
+    def test_verification_concurrente_ignoree(self):
+        """Une seule vérification à la fois par référence KKiaPay"""
+        cache.add('kkiapay:status_check:KKP-123', 1)
+        with mock.patch.object(self.service, '_make_api_request') as api:
+            self.assertFalse(self.service.check_transaction_status(self.transaction))
+        api.assert_not_called()
+
+    def test_verification_concurrente_relit_la_base(self):
+        """Pendant une vérification en cours, l'appelant reçoit le statut enregistré"""
+        cache.add('kkiapay:status_check:KKP-123', 1)
+        KKiaPayTransaction.objects.filter(pk=self.transaction.pk).update(status='success')
+        with mock.patch.object(self.service, '_make_api_request') as api:
+            self.assertTrue(self.service.check_transaction_status(self.transaction))
+        api.assert_not_called()
+        self.assertEqual(self.transaction.status, 'success')
+
+    def test_verrou_borne(self):
+        """Le verrou couvre l'appel sans survivre longtemps à un worker interrompu"""
+        with mock.patch.object(services.cache, 'add', return_value=False) as add:
+            self.service.check_transaction_status(self.transaction)
+        self.assertEqual(
+            add.call_args.kwargs['timeout'],
+            min(self.service._max_request_duration, KKiaPayService.STATUS_LOCK_MAX_TTL)
+        )
+
+        reponse = mock.Mock()
+        reponse.getheader.return_value = '3600'
+        retry = self.service.session.get_adapter('https://').max_retries
+        self.assertEqual(retry.get_retry_after(reponse), KKiaPayService.RETRY_AFTER_MAX)
+
+    def test_initiation_insert_puis_mise_a_jour_ciblee(self):
+        """La transaction est enregistrée avant l'appel API puis mise à jour sur ses seuls champs de réponse"""
+        with mock.patch.object(self.service, '_make_api_request', return_value={'transactionId': 'KKP-B'}) as api:
+            with CaptureQueriesContext(connection) as requetes:
+                transaction = self.service.initiate_payment(
+                    self.user, Decimal('2500.00'), '+22997000002', 'cotisation_tontine'
+                )
+
+        # L'API reçoit l'identifiant de la transaction déjà insérée
+        self.assertEqual(api.call_args.args[2]['data']['transaction_id'], str(transaction.id))
+        insert, update = [q['sql'] for q in requetes.captured_queries]
+        self.assertTrue(insert.startswith('INSERT'))
+        self.assertTrue(update.startswith('UPDATE'))
+        self.assertNotIn('"montant"', update)
+        transaction.refresh_from_db()
+        self.assertEqual((transaction.status, transaction.reference_kkiapay), ('processing', 'KKP-B'))
+
+    def test_echec_enregistrement_apres_acceptation(self):
+        """Une erreur de mise à jour après l'acceptation KKiaPay remonte et la transaction reste en attente"""
+        save = KKiaPayTransaction.save
+
+        def save_echoue_a_la_mise_a_jour(instance, *args, **kwargs):
+            if kwargs.get('update_fields'):
+                raise IntegrityError("verrou")
+            return save(instance, *args, **kwargs)
+
+        with mock.patch.object(self.service, '_make_api_request', return_value={'transactionId': 'KKP-C'}), \
+                mock.patch.object(KKiaPayTransaction, 'save', save_echoue_a_la_mise_a_jour):
+            with self.assertRaises(IntegrityError):
+                self.service.initiate_payment(
+                    self.user, Decimal('2500.00'), '+22997000003', 'cotisation_tontine'
+                )
+        transaction = KKiaPayTransaction.objects.get(numero_telephone='+22997000003')
+        self.assertEqual(transaction.status, 'pending')
+
+    def test_initiation_en_masse(self):
+        """Les paiements sont insérés et mis à jour par lots, un échec n'arrête pas les autres"""
+        specs = [
+            {
+                'user': self.user,
+                'amount': Decimal('1000.00'),
+                'phone_number': f'+2299700000{i}',
+                'transaction_type': 'cotisation_tontine'
+            }
+            for i in range(2)
+        ]
+        reponses = [{'transactionId': 'KKP-A'}, ValueError("réponse non JSON")]
+        with mock.patch.object(self.service, '_make_api_request', side_effect=reponses):
+            with self.assertNumQueries(2):
+                transactions = self.service.bulk_initiate_payments(specs)
+
+        statuts = dict(
+            KKiaPayTransaction.objects.filter(
+                id__in=[t.id for t in transactions]
+            ).values_list('reference_kkiapay', 'status')
+        )
+        self.assertEqual(statuts, {'KKP-A': 'processing', None: 'failed'})
+
+
+class KKiaPayServiceAliasTest(TestCase):
+    """Tests de l'alias paresseux kkiapay_service"""
+
+    def test_alias_delegue_a_l_instance_partagee(self):
+        """L'alias importé par les vues délègue au singleton"""
+        instance = mock.Mock(spec=KKiaPayService)
+        with mock.patch.object(services, '_kkiapay_service', instance):
+            kkiapay_service.check_transaction_status('tx')
+        instance.check_transaction_status.assert_called_once_with('tx')
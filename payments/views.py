@@ -153,10 +153,10 @@ class PaymentViewSet(viewsets.ReadOnlyModelViewSet):
         
         # Admin plateforme voit tout
         if hasattr(user, 'adminplateforme'):
-            return KKiaPayTransaction.objects.all()
+            return KKiaPayTransaction.objects.with_user()
         
         # Les autres voient leurs propres transactions
-        return KKiaPayTransaction.objects.filter(user=user)
+        return KKiaPayTransaction.objects.with_user().filter(user=user)
     
     @extend_schema(
         summary="Initier un paiement KKiaPay",
@@ -244,7 +244,7 @@ class PaymentViewSet(viewsets.ReadOnlyModelViewSet):
             # Sérialisation de la réponse
             response_serializer = KKiaPayTransactionSerializer(transaction)
             
-            logger.info(f"✅ Paiement initié: {transaction.reference_tontiflex}")
+            logger.info("✅ Paiement initié: %s", transaction.reference_tontiflex)
             
             return Response(
                 response_serializer.data,
@@ -252,13 +252,13 @@ class PaymentViewSet(viewsets.ReadOnlyModelViewSet):
             )
             
         except KKiaPayException as e:
-            logger.error(f"❌ Erreur KKiaPay: {str(e)}")
+            logger.error("❌ Erreur KKiaPay: %s", e)
             return Response(
                 {"error": str(e), "error_code": e.error_code},
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"❌ Erreur système: {str(e)}")
+            logger.error("❌ Erreur système: %s", e)
             return Response(
                 {"error": "Erreur technique lors de l'initiation du paiement"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -312,7 +312,7 @@ class PaymentViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            logger.error(f"❌ Erreur vérification statut: {str(e)}")
+            logger.error("❌ Erreur vérification statut: %s", e)
             return Response(
                 {"error": "Erreur lors de la vérification du statut"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -386,7 +386,7 @@ class PaymentViewSet(viewsets.ReadOnlyModelViewSet):
             })
             
         except Exception as e:
-            logger.error(f"❌ Erreur test SANDBOX: {str(e)}")
+            logger.error("❌ Erreur test SANDBOX: %s", e)
             return Response(
                 {"error": f"Erreur lors du test: {str(e)}"},
                 status=status.HTTP_400_BAD_REQUEST
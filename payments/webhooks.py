@@ -20,7 +20,7 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema
-import json
+import orjson
 
 from .services import kkiapay_service
 from .config import kkiapay_config
@@ -84,15 +84,15 @@ class KKiaPayWebhookView(APIView):
                 )
             
             # Parsing des données JSON
-            webhook_data = json.loads(payload.decode('utf-8'))
+            webhook_data = orjson.loads(payload)
             
-            logger.info(f"📥 Webhook KKiaPay reçu: {webhook_data.get('type', 'UNKNOWN')}")
+            logger.info("📥 Webhook KKiaPay reçu: %s", webhook_data.get('type', 'UNKNOWN'))
             
             # Traitement du webhook via le service
             transaction = kkiapay_service.process_webhook(webhook_data)
             
             if transaction:
-                logger.info(f"✅ Webhook traité avec succès: {transaction.reference_tontiflex}")
+                logger.info("✅ Webhook traité avec succès: %s", transaction.reference_tontiflex)
                 
                 # Déclencher les actions post-paiement selon le type
                 self._trigger_post_payment_actions(transaction)
@@ -108,14 +108,14 @@ class KKiaPayWebhookView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
                 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error("❌ Payload webhook invalide (JSON malformé)")
             return Response(
                 {"error": "JSON invalide"}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"❌ Erreur traitement webhook: {str(e)}")
+            logger.error("❌ Erreur traitement webhook: %s", e)
             return Response(
                 {"error": f"Erreur: {str(e)}"}, 
                 status=status.HTTP_400_BAD_REQUEST
@@ -166,11 +166,11 @@ class KKiaPayWebhookView(APIView):
                 self._handle_loan_repayment_success(transaction)
                 
         except Exception as e:
-            logger.error(f"❌ Erreur actions post-paiement: {str(e)}")
+            logger.error("❌ Erreur actions post-paiement: %s", e)
     
     def _handle_tontine_adhesion_success(self, transaction):
         """Actions après réussite d'une adhésion tontine"""
-        logger.info(f"🎯 Traitement adhésion tontine réussie: {transaction.reference_tontiflex}")
+        logger.info("🎯 Traitement adhésion tontine réussie: %s", transaction.reference_tontiflex)
         # TODO: Intégrer avec le modèle Adhesion
         from tontines.models import Adhesion
         try:
@@ -186,17 +186,17 @@ class KKiaPayWebhookView(APIView):
                 adhesion.save()
                 # Finaliser l'adhésion (création du participant)
                 adhesion.finaliser_adhesion()
-                logger.info(f"✅ Adhésion mise à jour suite paiement KKiaPay: {adhesion.id}")
+                logger.info("✅ Adhésion mise à jour suite paiement KKiaPay: %s", adhesion.id)
             else:
-                logger.info(f"ℹ️ Adhésion déjà traitée: {adhesion.id}")
+                logger.info("ℹ️ Adhésion déjà traitée: %s", adhesion.id)
         except Adhesion.DoesNotExist:
-            logger.error(f"❌ Aucun workflow Adhesion trouvé pour objet_id={transaction.objet_id}")
+            logger.error("❌ Aucun workflow Adhesion trouvé pour objet_id=%s", transaction.objet_id)
         except Exception as e:
-            logger.error(f"❌ Erreur lors de l'intégration KKiaPay/Adhesion: {str(e)}")
+            logger.error("❌ Erreur lors de l'intégration KKiaPay/Adhesion: %s", e)
     
     def _handle_tontine_cotisation_success(self, transaction):
         """Actions après réussite d'une cotisation tontine"""
-        logger.info(f"💰 Traitement cotisation tontine réussie: {transaction.reference_tontiflex}")
+        logger.info("💰 Traitement cotisation tontine réussie: %s", transaction.reference_tontiflex)
         # TODO: Intégrer avec le modèle Cotisation
         from tontines.models import Cotisation, TontineParticipant
         try:
@@ -214,13 +214,13 @@ class KKiaPayWebhookView(APIView):
                 if participant:
                     participant.solde = participant.solde + cotisation.montant if hasattr(participant, 'solde') else cotisation.montant
                     participant.save()
-                logger.info(f"✅ Cotisation mise à jour suite paiement KKiaPay: {cotisation.id}")
+                logger.info("✅ Cotisation mise à jour suite paiement KKiaPay: %s", cotisation.id)
             else:
-                logger.info(f"ℹ️ Cotisation déjà confirmée: {cotisation.id}")
+                logger.info("ℹ️ Cotisation déjà confirmée: %s", cotisation.id)
         except Cotisation.DoesNotExist:
-            logger.error(f"❌ Aucune cotisation trouvée pour objet_id={transaction.objet_id}")
+            logger.error("❌ Aucune cotisation trouvée pour objet_id=%s", transaction.objet_id)
         except Exception as e:
-            logger.error(f"❌ Erreur lors de l'intégration KKiaPay/Cotisation: {str(e)}")
+            logger.error("❌ Erreur lors de l'intégration KKiaPay/Cotisation: %s", e)
 
         # Intégration avec le modèle Retrait
         from tontines.models import Retrait
@@ -232,17 +232,17 @@ class KKiaPayWebhookView(APIView):
                 retrait.transaction_mobile_money = None  # À lier si transaction Mobile Money créée
                 retrait.date_validation_retrait = transaction.processed_at or transaction.updated_at or transaction.created_at
                 retrait.save()
-                logger.info(f"✅ Retrait confirmé suite paiement KKiaPay: {retrait.id}")
+                logger.info("✅ Retrait confirmé suite paiement KKiaPay: %s", retrait.id)
             else:
-                logger.info(f"ℹ️ Retrait déjà confirmé: {retrait.id}")
+                logger.info("ℹ️ Retrait déjà confirmé: %s", retrait.id)
         except Retrait.DoesNotExist:
-            logger.info(f"Aucun retrait trouvé pour objet_id={transaction.objet_id} (pas bloquant)")
+            logger.info("Aucun retrait trouvé pour objet_id=%s (pas bloquant)", transaction.objet_id)
         except Exception as e:
-            logger.error(f"❌ Erreur lors de l'intégration KKiaPay/Retrait: {str(e)}")
+            logger.error("❌ Erreur lors de l'intégration KKiaPay/Retrait: %s", e)
     
     def _handle_savings_success(self, transaction):
         """Actions après réussite d'une transaction épargne"""
-        logger.info(f"🏦 Traitement épargne réussie: {transaction.reference_tontiflex}")
+        logger.info("🏦 Traitement épargne réussie: %s", transaction.reference_tontiflex)
         # TODO: Intégrer avec le modèle SavingsAccount
         
         # Intégration avec le modèle SavingsAccount (création compte, dépôts, retraits)
@@ -255,9 +255,9 @@ class KKiaPayWebhookView(APIView):
                     account.statut = SavingsAccount.StatutChoices.PAIEMENT_EFFECTUE
                     account.transaction_frais_creation = None  # À lier si besoin
                     account.save()
-                    logger.info(f"✅ Compte épargne mis à jour (frais payés): {account.id}")
+                    logger.info("✅ Compte épargne mis à jour (frais payés): %s", account.id)
                 else:
-                    logger.info(f"ℹ️ Compte épargne déjà marqué comme payé: {account.id}")
+                    logger.info("ℹ️ Compte épargne déjà marqué comme payé: %s", account.id)
             # Dépôt ou retrait sur compte épargne
             elif transaction.type_transaction in ['depot_epargne', 'retrait_epargne']:
                 savings_tx = SavingsTransaction.objects.get(id=transaction.objet_id)
@@ -265,19 +265,19 @@ class KKiaPayWebhookView(APIView):
                     savings_tx.statut = SavingsTransaction.StatutChoices.CONFIRMEE
                     savings_tx.date_confirmation = transaction.processed_at or transaction.updated_at or transaction.created_at
                     savings_tx.save()
-                    logger.info(f"✅ Transaction épargne confirmée: {savings_tx.id}")
+                    logger.info("✅ Transaction épargne confirmée: %s", savings_tx.id)
                 else:
-                    logger.info(f"ℹ️ Transaction épargne déjà confirmée: {savings_tx.id}")
+                    logger.info("ℹ️ Transaction épargne déjà confirmée: %s", savings_tx.id)
         except SavingsAccount.DoesNotExist:
-            logger.error(f"❌ Aucun compte épargne trouvé pour objet_id={transaction.objet_id}")
+            logger.error("❌ Aucun compte épargne trouvé pour objet_id=%s", transaction.objet_id)
         except SavingsTransaction.DoesNotExist:
-            logger.error(f"❌ Aucune transaction épargne trouvée pour objet_id={transaction.objet_id}")
+            logger.error("❌ Aucune transaction épargne trouvée pour objet_id=%s", transaction.objet_id)
         except Exception as e:
-            logger.error(f"❌ Erreur lors de l'intégration KKiaPay/Savings: {str(e)}")
+            logger.error("❌ Erreur lors de l'intégration KKiaPay/Savings: %s", e)
     
     def _handle_loan_repayment_success(self, transaction):
         """Actions après réussite d'un remboursement prêt"""
-        logger.info(f"💳 Traitement remboursement prêt réussi: {transaction.reference_tontiflex}")
+        logger.info("💳 Traitement remboursement prêt réussi: %s", transaction.reference_tontiflex)
         # TODO: Intégrer avec le modèle Loan
 
         # Intégration avec le modèle Payment (remboursement prêt)
@@ -291,13 +291,13 @@ class KKiaPayWebhookView(APIView):
                 payment.save()
                 # Appeler la méthode métier pour finaliser le paiement
                 payment.confirmer_paiement()
-                logger.info(f"✅ Paiement de prêt confirmé suite paiement KKiaPay: {payment.id}")
+                logger.info("✅ Paiement de prêt confirmé suite paiement KKiaPay: %s", payment.id)
             else:
-                logger.info(f"ℹ️ Paiement de prêt déjà confirmé: {payment.id}")
+                logger.info("ℹ️ Paiement de prêt déjà confirmé: %s", payment.id)
         except Payment.DoesNotExist:
-            logger.error(f"❌ Aucun paiement de prêt trouvé pour objet_id={transaction.objet_id}")
+            logger.error("❌ Aucun paiement de prêt trouvé pour objet_id=%s", transaction.objet_id)
         except Exception as e:
-            logger.error(f"❌ Erreur lors de l'intégration KKiaPay/Loan: {str(e)}")
+            logger.error("❌ Erreur lors de l'intégration KKiaPay/Loan: %s", e)
 
 
 def webhook_view(request):
@@ -124,6 +124,47 @@ DATABASES = {
 #     }
 
 
+# --- Cache Configuration ---
+# Redis partagé entre workers si REDIS_URL est défini (Render), sinon
+# cache mémoire local pour le développement.
+REDIS_URL = env('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'TIMEOUT': 300,
+            'KEY_PREFIX': 'tontiflex',
+            'OPTIONS': {
+                'max_connections': 50,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'tontiflex-local',
+        }
+    }
+
+# Sessions servies par le cache : pas de lecture django_session par requête.
+# Sans Redis, cached_db garde la base comme source de vérité entre workers.
+SESSION_ENGINE = (
+    'django.contrib.sessions.backends.cache' if REDIS_URL
+    else 'django.contrib.sessions.backends.cached_db'
+)
+SESSION_CACHE_ALIAS = 'default'
+# --- End Cache Configuration ---
+
+
+# --- Notifications Configuration ---
+# Lignes par INSERT lors des envois en masse (borne la taille des requêtes SQL)
+NOTIF_BULK_BATCH = env.int('NOTIF_BULK_BATCH', default=500)
+# --- End Notifications Configuration ---
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -918,8 +918,8 @@ class Adhesion(models.Model):
         """Initie le paiement des frais d'adhésion via Mobile Money"""
         if self.statut_actuel != 'validee_agent':
             raise ValidationError("La demande doit être validée par un agent avant le paiement")
-        from payments.services import KKiaPayService  # MIGRATION : services_adhesion → KKiaPayService
-        service = KKiaPayService()
+        from payments.services import get_kkiapay_service  # MIGRATION : services_adhesion → KKiaPayService
+        service = get_kkiapay_service()
         resultat = service.initiate_payment(
             amount=self.frais_adhesion,
             phone=self.numero_telephone_paiement,
@@ -946,8 +946,8 @@ class Adhesion(models.Model):
         """Confirme le paiement des frais d'adhésion via KKiaPay"""
         if self.statut_actuel not in ['validee_agent', 'en_cours_paiement']:
             raise ValidationError("Paiement non autorisé pour ce statut")
-        from payments.services import KKiaPayService  # MIGRATION : services_adhesion → KKiaPayService
-        service = KKiaPayService()
+        from payments.services import get_kkiapay_service  # MIGRATION : services_adhesion → KKiaPayService
+        service = get_kkiapay_service()
         resultat = service.verify_transaction(reference_paiement)  # MIGRATION : traiter_confirmation_paiement → verify_transaction
         if not resultat.get('success'):
             logger.error(f"Erreur lors de la confirmation du paiement KKiaPay: {resultat.get('error')}")
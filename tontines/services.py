@@ -298,6 +298,10 @@ class AdhesionNotificationService:
     def programmer_rappels_paiement(workflow, client, tontine) -> bool:
         """
         Programme des rappels automatiques pour le paiement.
+
+        Les rappels sont mis en file via NotificationService.regrouper() :
+        True signifie qu'ils sont programmés, leur insertion n'a lieu qu'à
+        la validation de la transaction en cours.
         """
         try:
             from datetime import timedelta
@@ -308,27 +312,29 @@ class AdhesionNotificationService:
                 timezone.now() + timedelta(days=6)
             ]
             
-            for i, date_rappel in enumerate(dates_rappel, 1):
-                message = (
-                    f"⏰ Rappel de paiement\n\n"
-                    f"N'oubliez pas de payer vos frais d'adhésion de {workflow.frais_adhesion_calcules:,.0f} FCFA "
-                    f"pour la tontine '{tontine.nom}'.\n\n"
-                    f"Il vous reste {7 - (3 * i)} jours pour effectuer ce paiement."
-                )
-                
-                # Créer notification de rappel
-                NotificationService.creer_notification(
-                    utilisateur=client.user,
-                    titre=f"⏰ Rappel #{i} - Paiement d'adhésion en attente",
-                    message=message,
-                    canal='app',
-                    objet_lie=workflow,
-                    donnees_supplementaires={
-                        'type_evenement': 'rappel_paiement',
-                        'numero_rappel': i,
-                        'workflow_id': str(workflow.id)
-                    }
-                )
+            # Une seule insertion pour tous les rappels, après validation de la transaction
+            with NotificationService.regrouper():
+                for i, date_rappel in enumerate(dates_rappel, 1):
+                    message = (
+                        f"⏰ Rappel de paiement\n\n"
+                        f"N'oubliez pas de payer vos frais d'adhésion de {workflow.frais_adhesion_calcules:,.0f} FCFA "
+                        f"pour la tontine '{tontine.nom}'.\n\n"
+                        f"Il vous reste {7 - (3 * i)} jours pour effectuer ce paiement."
+                    )
+
+                    # Créer notification de rappel
+                    NotificationService.mettre_en_file(
+                        utilisateur=client.user,
+                        titre=f"⏰ Rappel #{i} - Paiement d'adhésion en attente",
+                        message=message,
+                        canal='app',
+                        objet_lie=workflow,
+                        donnees_supplementaires={
+                            'type_evenement': 'rappel_paiement',
+                            'numero_rappel': i,
+                            'workflow_id': str(workflow.id)
+                        }
+                    )
             
             logger.info(f"Rappels de paiement programmés pour le workflow {workflow.id}")
             return True